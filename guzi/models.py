@@ -1,4 +1,5 @@
-import collections
+import collections.abc
+import copy
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 
@@ -102,21 +103,27 @@ class User(SpendableEntity):
         target.add_invests(self.invest_wallet[:amount])
         del self.invest_wallet[:amount]
 
-    def check_outdated_moneys(self, date):
+    def check_outdated_moneys(self, date, days=30):
         """
         Pass through every User's Guzis and add outdated ones
-        (>30 days old) to User's economic_exp
+        (>days old, 30 by default) to User's economic_exp
+        """
+        self.outdate(self.outdated_moneys(date, days))
+
+    def outdated_moneys(self, date, days=30):
+        """
+        Return User's Guzis (and Invests) which are >days old at given date,
+        without outdating them
         """
         moneys_to_outdate = []
         for money in self.money_wallet + self.invest_wallet:
             # extract the date from the first 10 characters (YYYY-MM-DD)
             creation_date = date.fromisoformat(money[:10])
-            if date - creation_date >= timedelta(days=30):
+            if date - creation_date >= timedelta(days=days):
                 moneys_to_outdate.append(money)
+        return moneys_to_outdate
 
-        self.outdate(moneys_to_outdate)
-
-    def create_daily_money_and_invest(self, date):
+    def create_daily_money_and_invest(self, date, number=None):
         """
         Create daily Guzis for User.
         Daily_Guzis = (economic_exp)^(1/3) + 1
@@ -124,12 +131,25 @@ class User(SpendableEntity):
         <date>-<owner_id>-money<money_index>"
             <date> : 2010-04-18
             <money_index> : 4 digits index ("0001", "0342")
+        number overrides the daily_moneys() number of Guzis to create.
         """
-        number_of_moneys_to_add = self.daily_moneys()
+        number_of_moneys_to_add = self.daily_moneys() if number is None else number
         for i in range(number_of_moneys_to_add):
             self.money_wallet.append(GuziCreator.create_money(self, date, i))
             self.invest_wallet.append(GuziCreator.create_invest(self, date, i))
 
+    def copy(self):
+        """
+        Return a copy of the User with its own wallets.
+        Moneys themselves are immutable strings, so they are shared, not copied.
+        """
+        user = copy.copy(self)
+        user.money_wallet = list(self.money_wallet)
+        user.invest_wallet = list(self.invest_wallet)
+        user.economic_exp = list(self.economic_exp)
+        user.invest_trashbin = list(self.invest_trashbin)
+        return user
+
     def _is_money(self, money):
         return money[-9:-4] == "money"
 
@@ -175,6 +195,18 @@ class Ecosystem(SpendableEntity):
     def add_founder(self, user, times):
         self.engaged_strategy.add_founder(user, times)
 
+    def copy(self, users=None):
+        """
+        Return a copy of the Ecosystem with its own wallet and engaged strategy.
+        users is an optional mapping (id -> User) the copied strategy will use
+        to find the users it pays. Without it, the copy pays the same User
+        objects as this Ecosystem : Users are never copied here.
+        """
+        ecosystem = copy.copy(self)
+        ecosystem.money_wallet = list(self.money_wallet)
+        ecosystem.engaged_strategy = self.engaged_strategy.copy(users)
+        return ecosystem
+
     def pay(self, moneys):
         """
         When a User or an Ecosystem pays an Ecosystem, the paied Invests don't stay in
@@ -237,15 +269,234 @@ class DefaultEngagedStrategy:
         for t in range(times):
             self.founders.append(user.id)
 
+    def copy(self, users=None):
+        """
+        Return a copy of the strategy with its own engaged and founders lists.
+        If users mapping is given, it replaces the users dict. Otherwise the
+        users dict is copied, but the User objects it contains are shared
+        (for a Population Ecosystem, the copy pays the Population's users).
+        """
+        strategy = copy.copy(self)
+        strategy.users = self.users.copy() if users is None else users
+        strategy.engaged_users = list(self.engaged_users)
+        strategy.founders = list(self.founders)
+        return strategy
+
     def pay(self, moneys):
         for g in moneys:
             self._pay_money(g)
 
     def _pay_money(self, money):
         if len(self.engaged_users) == 0:
-            self.users[self.founders[self.founders_index]].pay([money])
+            self._payee(self.founders[self.founders_index]).pay([money])
             self.founders_index += 1
             self.founders_index %= len(self.founders)
         else:
-            self.users[self.engaged_users[0]].pay(money)
+            self._payee(self.engaged_users[0]).pay(money)
             del self.engaged_users[0]
+
+    def _payee(self, id):
+        if isinstance(self.users, _PopulationUsers):
+            return self.users.for_payment(id)
+        return self.users[id]
+
+
+class Population:
+    """
+    Population holds Users and Ecosystems by id and can be forked cheaply to
+    run several scenarios from the same baseline.
+    A fork shares every entity with its parent. An entity is only copied (with
+    Entity.copy) the first time it is got for modification through user() or
+    ecosystem() after a fork, so unchanged wallets are never duplicated.
+    peek_user() and peek_ecosystem() give read only access and never copy.
+    Each Population has its own policy :
+      - outdate_days : age (in days) from which Guzis get outdated
+      - daily_moneys : function(user) returning the number of Guzis a user
+        gets each day, or None to use user.daily_moneys()
+    which are used by check_outdated_moneys() and create_daily_money_and_invest()
+    Example :
+      - baseline = Population([user1, user2], [ecosystem])
+      - scenario = baseline.fork(outdate_days=15)
+      - scenario.check_outdated_moneys(date)
+      Then baseline users are unchanged and users with no outdated Guzi are
+      still shared.
+    Always get entities through user() and ecosystem() before modifying them :
+    an entity got before a fork is shared with the fork and must not be
+    modified anymore.
+    """
+    def __init__(self, users=(), ecosystems=(), outdate_days=30,
+            daily_moneys=None):
+        self.outdate_days = outdate_days
+        self.daily_moneys = daily_moneys
+        self._users = {}
+        self._ecosystems = {}
+        self._owned_users = set()
+        self._owned_ecosystems = set()
+        for user in users:
+            self.add_user(user)
+        for ecosystem in ecosystems:
+            self.add_ecosystem(ecosystem)
+
+    def add_user(self, user):
+        """
+        Add given User to the Population, which now owns it : the User must not
+        belong to another Population
+        """
+        if user.id in self._users:
+            raise ValueError("User {} already in population".format(user.id))
+        self._users[user.id] = user
+        self._owned_users.add(user.id)
+
+    def add_ecosystem(self, ecosystem):
+        """
+        Add given Ecosystem to the Population. Its engaged users are added too
+        if they are not in it yet, and its engaged strategy is bound to the
+        Population so that paying the Ecosystem pays the users of this
+        Population.
+        If the Ecosystem (and so its users) belongs to another Population, they
+        are copied. Otherwise, the given Ecosystem itself is added.
+        """
+        if ecosystem.id in self._ecosystems:
+            raise ValueError("Ecosystem {} already in population".format(ecosystem.id))
+        users = ecosystem.engaged_strategy.users
+        if isinstance(users, _PopulationUsers):
+            for id in users:
+                if id not in self._users:
+                    self.add_user(users.population.peek_user(id).copy())
+            ecosystem = ecosystem.copy(_PopulationUsers(self, users))
+        else:
+            for user in users.values():
+                if user.id not in self._users:
+                    self.add_user(user)
+                elif self._users[user.id] is not user:
+                    raise ValueError("Another User {} already in population".format(user.id))
+            ecosystem.engaged_strategy.users = _PopulationUsers(self, users)
+        self._ecosystems[ecosystem.id] = ecosystem
+        self._owned_ecosystems.add(ecosystem.id)
+
+    def user(self, id):
+        """
+        Return the User with given id to modify it, copying it first if it is
+        shared with another Population
+        """
+        if id not in self._owned_users:
+            self._users[id] = self._users[id].copy()
+            self._owned_users.add(id)
+        return self._users[id]
+
+    def ecosystem(self, id):
+        """
+        Return the Ecosystem with given id to modify it, copying it first if it
+        is shared with another Population
+        """
+        if id not in self._owned_ecosystems:
+            ecosystem = self._ecosystems[id]
+            users = _PopulationUsers(self, ecosystem.engaged_strategy.users)
+            self._ecosystems[id] = ecosystem.copy(users)
+            self._owned_ecosystems.add(id)
+        return self._ecosystems[id]
+
+    def peek_user(self, id):
+        """
+        Return the User with given id, which may be shared with another
+        Population : it must not be modified
+        """
+        return self._users[id]
+
+    def peek_ecosystem(self, id):
+        """
+        Return the Ecosystem with given id, which may be shared with another
+        Population : it must not be modified
+        """
+        return self._ecosystems[id]
+
+    def user_ids(self):
+        return list(self._users)
+
+    def ecosystem_ids(self):
+        return list(self._ecosystems)
+
+    def check_outdated_moneys(self, date):
+        """
+        Outdate every User's Guzis older than outdate_days.
+        Only Users having outdated Guzis are copied.
+        """
+        for id in self._users:
+            moneys = self.peek_user(id).outdated_moneys(date, self.outdate_days)
+            if len(moneys) > 0:
+                self.user(id).outdate(moneys)
+
+    def create_daily_money_and_invest(self, date):
+        """
+        Create daily Guzis of every User, using daily_moneys policy
+        """
+        for id in self._users:
+            user = self.user(id)
+            number = None if self.daily_moneys is None else self.daily_moneys(user)
+            user.create_daily_money_and_invest(date, number)
+
+    def fork(self, outdate_days=None, daily_moneys=None):
+        """
+        Return a new Population sharing every entity with this one.
+        Both Populations lose ownership of shared entities, so that each one
+        copies an entity before modifying it.
+        outdate_days and daily_moneys policies are the same as this one's,
+        unless given.
+        """
+        population = Population(
+            outdate_days=self.outdate_days if outdate_days is None else outdate_days,
+            daily_moneys=self.daily_moneys if daily_moneys is None else daily_moneys)
+        population._users = dict(self._users)
+        population._ecosystems = dict(self._ecosystems)
+        self._owned_users = set()
+        self._owned_ecosystems = set()
+        return population
+
+
+class _PopulationUsers(collections.abc.MutableMapping):
+    """
+    Users mapping given to the engaged strategies of a Population Ecosystems.
+    It only holds the ids of the strategy users. Reading it never copies a
+    User : only for_payment() returns the Population's own copy of a User, so
+    that paying never modifies a User shared with another Population.
+    """
+    def __init__(self, population, ids=()):
+        self.population = population
+        # dict used as an ordered set
+        self.ids = dict.fromkeys(ids)
+
+    def for_payment(self, id):
+        if id not in self.ids:
+            raise KeyError(id)
+        return self.population.user(id)
+
+    def copy(self):
+        return _PopulationUsers(self.population, self.ids)
+
+    def __getitem__(self, id):
+        if id not in self.ids:
+            raise KeyError(id)
+        return self.population.peek_user(id)
+
+    def __setitem__(self, id, user):
+        """
+        Add given User to the Population if not in it yet.
+        Raise an error if another User with the same id is already in it.
+        """
+        if id not in self.population._users:
+            self.population.add_user(user)
+        elif self.population.peek_user(id) is not user:
+            raise ValueError("Another User {} already in population".format(id))
+        self.ids[id] = None
+
+    def __delitem__(self, id):
+        del self.ids[id]
+
+    def __contains__(self, id):
+        return id in self.ids
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
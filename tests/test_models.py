@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock
 from datetime import date
 
-from guzi.models import User, Ecosystem, GuziCreator, DefaultEngagedStrategy
+from guzi.models import User, Ecosystem, GuziCreator, DefaultEngagedStrategy, Population
 
 class TestUser(unittest.TestCase):
 
@@ -213,6 +213,29 @@ class TestUser(unittest.TestCase):
         self.assertEqual(len(user.invest_wallet), 0)
         self.assertEqual(len(user.economic_exp), 2)
 
+    def test_check_outdated_moneys_with_given_days(self):
+        user = User("id", None)
+        user.create_daily_money_and_invest(date(2010, 1, 1))
+
+        user.check_outdated_moneys(date(2010, 1, 10), days=10)
+        self.assertEqual(len(user.money_wallet), 1)
+
+        user.check_outdated_moneys(date(2010, 1, 11), days=10)
+        self.assertEqual(len(user.money_wallet), 0)
+        self.assertEqual(len(user.economic_exp), 2)
+
+    def test_copy_should_not_share_wallets(self):
+        user = User("id", None)
+        user.create_daily_money_and_invest(date(2010, 1, 1))
+
+        copied = user.copy()
+        copied.create_daily_money_and_invest(date(2010, 1, 2))
+
+        self.assertEqual(copied.id, "id")
+        self.assertEqual(len(copied.money_wallet), 2)
+        self.assertEqual(len(user.money_wallet), 1)
+        self.assertEqual(len(user.invest_wallet), 1)
+
     def test_create_daily_moneys_for_empty_total_accumulated(self):
         user = User("id", None)
 
@@ -389,3 +412,218 @@ class TestDefaultEngagedStrategy(unittest.TestCase):
         strategy.pay(["1", "2", "3", "4"])
         self.assertEqual(len(founder1.economic_exp), 2)
         self.assertEqual(len(founder2.economic_exp), 2)
+
+
+class TestPopulation(unittest.TestCase):
+
+    def test_add_user_should_raise_error_if_user_already_added(self):
+        population = Population([User("id", None)])
+
+        with self.assertRaises(ValueError):
+            population.add_user(User("id", None))
+
+    def test_add_ecosystem_should_add_its_users(self):
+        founder = User("founder", None)
+        population = Population(ecosystems=[Ecosystem("eco", [founder])])
+
+        self.assertEqual(population.user_ids(), ["founder"])
+        self.assertEqual(population.ecosystem_ids(), ["eco"])
+
+    def test_add_ecosystem_should_keep_given_ecosystem(self):
+        founder = User("founder", None)
+        ecosystem = Ecosystem("eco", [founder])
+        population = Population(ecosystems=[ecosystem])
+
+        ecosystem.add_invests(["a"])
+
+        self.assertIs(population.ecosystem("eco"), ecosystem)
+        self.assertEqual(population.peek_ecosystem("eco").money_wallet, ["a"])
+
+    def test_add_ecosystem_from_another_population_should_copy_only_its_users(self):
+        population = Population([User("other", None)],
+                [Ecosystem("eco", [User("founder", None)])])
+
+        new_population = Population()
+        new_population.add_ecosystem(population.peek_ecosystem("eco"))
+        new_population.ecosystem("eco").pay(["1"])
+
+        self.assertEqual(new_population.user_ids(), ["founder"])
+        self.assertIsNot(new_population.peek_user("founder"),
+                population.peek_user("founder"))
+        self.assertEqual(len(new_population.peek_user("founder").economic_exp), 1)
+        self.assertEqual(len(population.peek_user("founder").economic_exp), 0)
+
+    def test_user_should_not_copy_owned_user(self):
+        user = User("id", None)
+        population = Population([user])
+
+        self.assertIs(population.user("id"), user)
+
+    def test_peek_user_should_not_copy_shared_user(self):
+        population = Population([User("id", None)])
+
+        fork = population.fork()
+
+        self.assertIs(fork.peek_user("id"), population.peek_user("id"))
+
+    def test_fork_should_share_unchanged_users(self):
+        population = Population([User("id1", None), User("id2", None)])
+
+        fork = population.fork()
+        fork.user("id1").create_daily_money_and_invest(date(2010, 1, 1))
+
+        self.assertIs(fork.peek_user("id2"), population.peek_user("id2"))
+        self.assertIsNot(fork.peek_user("id1"), population.peek_user("id1"))
+        self.assertEqual(len(fork.peek_user("id1").money_wallet), 1)
+        self.assertEqual(len(population.peek_user("id1").money_wallet), 0)
+
+    def test_fork_should_not_be_modified_by_parent(self):
+        population = Population([User("id", None)])
+
+        fork = population.fork()
+        population.user("id").create_daily_money_and_invest(date(2010, 1, 1))
+
+        self.assertEqual(len(population.peek_user("id").money_wallet), 1)
+        self.assertEqual(len(fork.peek_user("id").money_wallet), 0)
+
+    def test_fork_of_fork_should_not_modify_parents(self):
+        population = Population([User("id", None)])
+
+        fork = population.fork()
+        fork.user("id").create_daily_money_and_invest(date(2010, 1, 1))
+        fork_of_fork = fork.fork()
+        fork_of_fork.user("id").create_daily_money_and_invest(date(2010, 1, 2))
+
+        self.assertEqual(len(population.peek_user("id").money_wallet), 0)
+        self.assertEqual(len(fork.peek_user("id").money_wallet), 1)
+        self.assertEqual(len(fork_of_fork.peek_user("id").money_wallet), 2)
+
+    def test_fork_ecosystem_should_pay_fork_users(self):
+        founder = User("founder", None)
+        population = Population(ecosystems=[Ecosystem("eco", [founder])])
+
+        fork = population.fork()
+        fork.ecosystem("eco").pay(["1", "2"])
+
+        self.assertEqual(len(fork.peek_user("founder").economic_exp), 2)
+        self.assertEqual(len(population.peek_user("founder").economic_exp), 0)
+
+    def test_fork_ecosystem_should_pay_fork_engaged_users(self):
+        population = Population(ecosystems=[Ecosystem("eco", [User("founder", None)])])
+        population.ecosystem("eco").add_engaged(User("engaged", None), 1)
+
+        fork = population.fork()
+        fork.ecosystem("eco").pay(["1"])
+
+        self.assertEqual(fork.peek_user("engaged").economic_exp, ["1"])
+        self.assertEqual(population.peek_user("engaged").economic_exp, [])
+        self.assertEqual(fork.peek_ecosystem("eco").engaged_strategy.engaged_users, [])
+        self.assertEqual(population.peek_ecosystem("eco").engaged_strategy.engaged_users,
+                ["engaged"])
+
+    def test_fork_ecosystem_add_engaged_should_add_user_to_fork(self):
+        founder = User("founder", None)
+        population = Population(ecosystems=[Ecosystem("eco", [founder])])
+
+        fork = population.fork()
+        fork.ecosystem("eco").add_engaged(User("engaged", None), 2)
+
+        self.assertEqual(fork.user_ids(), ["founder", "engaged"])
+        self.assertEqual(population.user_ids(), ["founder"])
+        self.assertEqual(len(population.peek_ecosystem("eco").engaged_strategy.engaged_users), 0)
+
+    def test_copy_population_ecosystem_should_keep_its_users(self):
+        founder = User("founder", None)
+        population = Population(ecosystems=[Ecosystem("eco", [founder])])
+
+        copied = population.ecosystem("eco").copy()
+
+        self.assertEqual(copied.engaged_strategy.users, {"founder": founder})
+
+    def test_fork_should_use_given_outdate_days(self):
+        user = User("id", None)
+        user.create_daily_money_and_invest(date(2010, 1, 1))
+        population = Population([user])
+
+        fork = population.fork(outdate_days=10)
+        population.check_outdated_moneys(date(2010, 1, 15))
+        fork.check_outdated_moneys(date(2010, 1, 15))
+
+        self.assertEqual(len(population.peek_user("id").money_wallet), 1)
+        self.assertEqual(len(fork.peek_user("id").money_wallet), 0)
+
+    def test_check_outdated_moneys_should_not_copy_users_without_outdated_moneys(self):
+        population = Population([User("id", None)])
+
+        fork = population.fork()
+        fork.check_outdated_moneys(date(2010, 1, 1))
+
+        self.assertIs(fork.peek_user("id"), population.peek_user("id"))
+
+    def test_fork_should_use_given_daily_moneys(self):
+        population = Population([User("id", None)])
+
+        fork = population.fork(daily_moneys=lambda user: 3)
+        population.create_daily_money_and_invest(date(2010, 1, 1))
+        fork.create_daily_money_and_invest(date(2010, 1, 1))
+        fork_of_fork = fork.fork()
+        fork_of_fork.create_daily_money_and_invest(date(2010, 1, 2))
+
+        self.assertEqual(len(population.peek_user("id").money_wallet), 1)
+        self.assertEqual(len(fork.peek_user("id").money_wallet), 3)
+        self.assertEqual(len(fork_of_fork.peek_user("id").money_wallet), 6)
+
+    def test_create_daily_money_and_invest_should_use_user_daily_moneys_by_default(self):
+        class RichUser(User):
+            def daily_moneys(self):
+                return 5
+        population = Population([RichUser("rich", None), User("id", None)])
+
+        population.fork().create_daily_money_and_invest(date(2010, 1, 1))
+        population.create_daily_money_and_invest(date(2010, 1, 1))
+
+        self.assertEqual(len(population.peek_user("rich").money_wallet), 5)
+        self.assertEqual(len(population.peek_user("id").money_wallet), 1)
+
+    def test_reading_ecosystem_users_should_not_copy_shared_users(self):
+        population = Population(ecosystems=[Ecosystem("eco", [User("founder", None)])])
+
+        fork = population.fork()
+        users = fork.peek_ecosystem("eco").engaged_strategy.users
+
+        self.assertIn("founder", users)
+        self.assertIs(users["founder"], population.peek_user("founder"))
+        self.assertIs(fork.peek_user("founder"), population.peek_user("founder"))
+
+    def test_copy_forked_ecosystem_should_not_copy_its_users(self):
+        population = Population(ecosystems=[Ecosystem("eco", [User("founder", None)])])
+
+        fork = population.fork()
+        copied = fork.peek_ecosystem("eco").copy()
+
+        self.assertIs(fork.peek_user("founder"), population.peek_user("founder"))
+        # The copy pays the users of the Population the Ecosystem was bound
+        # to, copying them there first
+        copied.pay(["1"])
+        self.assertEqual(len(population.peek_user("founder").economic_exp), 1)
+        self.assertEqual(len(fork.peek_user("founder").economic_exp), 0)
+
+    def test_add_engaged_should_raise_error_if_another_user_has_same_id(self):
+        population = Population(ecosystems=[Ecosystem("eco", [User("founder", None)])])
+
+        with self.assertRaises(ValueError):
+            population.ecosystem("eco").add_engaged(User("founder", None), 1)
+
+    def test_add_engaged_should_accept_population_user(self):
+        population = Population(ecosystems=[Ecosystem("eco", [User("founder", None)])])
+
+        population.ecosystem("eco").add_engaged(population.peek_user("founder"), 1)
+
+        self.assertEqual(population.peek_ecosystem("eco").engaged_strategy.engaged_users,
+                ["founder"])
+
+    def test_add_ecosystem_should_raise_error_if_another_user_has_same_id(self):
+        population = Population([User("founder", None)])
+
+        with self.assertRaises(ValueError):
+            population.add_ecosystem(Ecosystem("eco", [User("founder", None)]))